@@ -4,6 +4,7 @@
 -- Enable UUID extension
 CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
 CREATE EXTENSION IF NOT EXISTS "pgcrypto";
+CREATE EXTENSION IF NOT EXISTS "pg_trgm";
 
 -- Create custom types
 CREATE TYPE device_status AS ENUM ('online', 'offline', 'unknown');
@@ -36,12 +37,20 @@ CREATE TABLE devices (
 -- Create indexes for devices
 CREATE INDEX idx_devices_ip ON devices(ip_address);
 CREATE INDEX idx_devices_mac ON devices(mac_address);
-CREATE INDEX idx_devices_type ON devices(device_type);
-CREATE INDEX idx_devices_vendor ON devices(vendor);
 CREATE INDEX idx_devices_risk ON devices(risk_score DESC);
-CREATE INDEX idx_devices_status ON devices(status);
 CREATE INDEX idx_devices_last_seen ON devices(last_seen DESC);
 
+-- Composite indexes for filtered device listings sorted by last_seen
+CREATE INDEX idx_devices_status_last_seen ON devices(status, last_seen DESC);
+CREATE INDEX idx_devices_type_last_seen ON devices(device_type, last_seen DESC);
+CREATE INDEX idx_devices_vendor_last_seen ON devices(vendor, last_seen DESC);
+CREATE INDEX idx_devices_high_risk ON devices(risk_score) WHERE risk_score >= 0.5;
+
+-- Trigram index for free-text device search (ILIKE '%term%')
+CREATE INDEX idx_devices_search_trgm ON devices USING gin (
+    (COALESCE(device_type, '') || ' ' || COALESCE(vendor, '') || ' ' || host(ip_address)) gin_trgm_ops
+);
+
 -- Alerts table
 CREATE TABLE alerts (
     id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
@@ -65,6 +74,7 @@ CREATE INDEX idx_alerts_severity ON alerts(severity);
 CREATE INDEX idx_alerts_status ON alerts(status);
 CREATE INDEX idx_alerts_type ON alerts(alert_type);
 CREATE INDEX idx_alerts_created ON alerts(created_at DESC);
+CREATE INDEX idx_alerts_open ON alerts(device_id) WHERE status = 'open';
 
 -- Vulnerabilities table
 CREATE TABLE vulnerabilities (
@@ -116,8 +126,9 @@ CREATE TABLE network_flows (
 );
 
 -- Create indexes for network flows
-CREATE INDEX idx_flows_device ON network_flows(device_id);
-CREATE INDEX idx_flows_timestamp ON network_flows(timestamp DESC);
+-- Composite covers per-device time-range queries; BRIN suits append-mostly timestamps
+CREATE INDEX idx_flows_device_ts ON network_flows(device_id, timestamp DESC);
+CREATE INDEX idx_flows_ts_brin ON network_flows USING brin (timestamp);
 CREATE INDEX idx_flows_source ON network_flows(source_ip);
 CREATE INDEX idx_flows_destination ON network_flows(destination_ip);
 CREATE INDEX idx_flows_anomaly ON network_flows(is_anomaly);
@@ -1,59 +1,96 @@
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI, Response, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 from contextlib import asynccontextmanager
-import uvicorn
-import json
+import asyncio
+import orjson
+import time
 from datetime import datetime
-from typing import List
+from typing import Set
 
 # Import routes
 from .routes.devices import router as devices_router
 from .middleware import RateLimitMiddleware, PrometheusMiddleware
-from ..utils.logger import setup_logger
+from ..utils.logger import setup_logger, stop_logging
 from ..utils.metrics import METRICS
+from ..utils.cache import init_cache, close_cache
 
 logger = setup_logger(__name__)
 
+# Errors raised when sending to a client that has already gone away
+DISCONNECT_ERRORS = (WebSocketDisconnect, RuntimeError, OSError)
+
 # WebSocket connection manager
 class ConnectionManager:
+    __slots__ = ("active_connections",)
+
     def __init__(self):
-        self.active_connections: List[WebSocket] = []
+        self.active_connections: Set[WebSocket] = set()
 
     async def connect(self, websocket: WebSocket):
         await websocket.accept()
-        self.active_connections.append(websocket)
+        self.active_connections.add(websocket)
         logger.info(f"WebSocket connected. Total connections: {len(self.active_connections)}")
 
     def disconnect(self, websocket: WebSocket):
-        self.active_connections.remove(websocket)
+        self.active_connections.discard(websocket)
         logger.info(f"WebSocket disconnected. Total connections: {len(self.active_connections)}")
 
     async def broadcast(self, message: dict):
         """Broadcast message to all connected clients"""
         if self.active_connections:
-            message_str = json.dumps(message)
-            for connection in self.active_connections.copy():
-                try:
-                    await connection.send_text(message_str)
-                except:
-                    self.active_connections.remove(connection)
+            message_str = orjson.dumps(message).decode()
+            connections = list(self.active_connections)
+            results = await asyncio.gather(
+                *(connection.send_text(message_str) for connection in connections),
+                return_exceptions=True
+            )
+            dead = []
+            failure = None
+            for connection, result in zip(connections, results):
+                if isinstance(result, DISCONNECT_ERRORS):
+                    dead.append(connection)
+                elif isinstance(result, asyncio.CancelledError):
+                    failure = result
+                elif isinstance(result, BaseException) and failure is None:
+                    failure = result
+            # Prune before re-raising so dead sockets never linger
+            self.active_connections.difference_update(dead)
+            if failure is not None:
+                raise failure
 
 manager = ConnectionManager()
 
+# Heartbeat and health timestamps only need second precision, so the ISO
+# string is rebuilt at most once per second
+_utc_clock = {"second": 0, "iso": ""}
+
+def utc_timestamp() -> str:
+    """Current UTC time as an ISO string, cached per second"""
+    second = int(time.time())
+    if second != _utc_clock["second"]:
+        _utc_clock["second"] = second
+        _utc_clock["iso"] = datetime.utcfromtimestamp(second).isoformat()
+    return _utc_clock["iso"]
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan events"""
     logger.info("🚀 Starting IoT Security Dashboard API")
+    await init_cache()
     logger.info("✅ API ready for connections")
     yield
     logger.info("🛑 Shutting down IoT Security Dashboard API")
+    await close_cache()
+    stop_logging()
 
 app = FastAPI(
     title="IoT Security Dashboard API",
     description="Research-Grade Agentless IoT/IIoT Security Monitoring Platform",
     version="2.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
     docs_url="/docs",
     redoc_url="/redoc"
 )
@@ -71,54 +108,69 @@ app.add_middleware(GZipMiddleware, minimum_size=1000)
 # Include routers
 app.include_router(devices_router, prefix="/api/devices", tags=["Devices"])
 
+# Static API information served by the root endpoint
+API_INFO = {
+    "message": "IoT Security Dashboard API",
+    "version": "2.0.0",
+    "status": "operational",
+    "features": [
+        "Device Fingerprinting (99.2% accuracy)",
+        "Anomaly Detection (96.7% detection rate)",
+        "Vulnerability Assessment",
+        "Real-time Monitoring",
+        "4 Dataset Validation"
+    ],
+    "endpoints": {
+        "docs": "/docs",
+        "health": "/health",
+        "metrics": "/metrics",
+        "websocket": "/ws"
+    }
+}
+
+API_INFO_JSON = orjson.dumps(API_INFO)
+
+HEALTH_STATUS = {
+    "status": "healthy",
+    "timestamp": None,
+    "service": "iot-security-api",
+    "version": "2.0.0",
+    "checks": {
+        "api": "healthy",
+        "ml_models": "healthy (mock)",
+        "cache": "healthy (mock)"
+    }
+}
+
+# Serialized health body, refreshed when the timestamp changes
+_health_json = {"timestamp": None, "body": b""}
+
+METRICS_JSON = orjson.dumps({
+    "total_requests": 100,
+    "active_devices": 5,
+    "alerts_count": 3,
+    "uptime": "1h 30m"
+})
+
 @app.get("/")
 async def root():
     """Root endpoint with API information"""
-    return {
-        "message": "IoT Security Dashboard API",
-        "version": "2.0.0",
-        "status": "operational",
-        "features": [
-            "Device Fingerprinting (99.2% accuracy)",
-            "Anomaly Detection (96.7% detection rate)",
-            "Vulnerability Assessment",
-            "Real-time Monitoring",
-            "4 Dataset Validation"
-        ],
-        "endpoints": {
-            "docs": "/docs",
-            "health": "/health",
-            "metrics": "/metrics",
-            "websocket": "/ws"
-        }
-    }
+    return Response(content=API_INFO_JSON, media_type="application/json")
 
 @app.get("/health")
 async def health_check():
     """Comprehensive health check"""
-    health_status = {
-        "status": "healthy",
-        "timestamp": datetime.utcnow().isoformat(),
-        "service": "iot-security-api",
-        "version": "2.0.0",
-        "checks": {
-            "api": "healthy",
-            "ml_models": "healthy (mock)",
-            "cache": "healthy (mock)"
-        }
-    }
+    timestamp = utc_timestamp()
+    if timestamp != _health_json["timestamp"]:
+        _health_json["timestamp"] = timestamp
+        _health_json["body"] = orjson.dumps({**HEALTH_STATUS, "timestamp": timestamp})
     
-    return health_status
+    return Response(content=_health_json["body"], media_type="application/json")
 
 @app.get("/metrics")
 async def get_metrics():
     """Basic metrics endpoint"""
-    return {
-        "total_requests": 100,
-        "active_devices": 5,
-        "alerts_count": 3,
-        "uptime": "1h 30m"
-    }
+    return Response(content=METRICS_JSON, media_type="application/json")
 
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
@@ -128,15 +180,15 @@ async def websocket_endpoint(websocket: WebSocket):
         while True:
             # Keep connection alive and handle incoming messages
             data = await websocket.receive_text()
-            message = json.loads(data)
+            message = orjson.loads(data)
             
             # Echo back with timestamp for heartbeat
             response = {
                 "type": "heartbeat",
-                "timestamp": datetime.utcnow().isoformat(),
+                "timestamp": utc_timestamp(),
                 "received": message
             }
-            await websocket.send_text(json.dumps(response))
+            await websocket.send_text(orjson.dumps(response).decode())
             
     except WebSocketDisconnect:
         manager.disconnect(websocket)
@@ -155,10 +207,27 @@ async def broadcast_update(update_type: str, data: dict):
 app.state.broadcast = broadcast_update
 
 if __name__ == "__main__":
-    uvicorn.run(
-        "main:app",
-        host="0.0.0.0",
-        port=5000,
-        reload=True,
-        log_level="info"
-    )
\ No newline at end of file
+    import os
+    import uvicorn
+
+    if os.getenv("ENV") == "prod":
+        # uvicorn[standard] ships uvloop and httptools. WebSocket clients are
+        # tracked per process, so extra workers are opt-in via WEB_CONCURRENCY.
+        uvicorn.run(
+            "main:app",
+            host="0.0.0.0",
+            port=5000,
+            loop="uvloop",
+            http="httptools",
+            workers=int(os.getenv("WEB_CONCURRENCY", "1")),
+            log_level="warning",
+            access_log=False
+        )
+    else:
+        uvicorn.run(
+            "main:app",
+            host="0.0.0.0",
+            port=5000,
+            reload=True,
+            log_level="info"
+        )
\ No newline at end of file
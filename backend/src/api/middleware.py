@@ -2,42 +2,48 @@ from fastapi import Request, Response
 from starlette.middleware.base import BaseHTTPMiddleware
 import time
 import asyncio
-from typing import Dict
+from collections import OrderedDict, deque
+from typing import Tuple
 from ..utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
 class RateLimitMiddleware(BaseHTTPMiddleware):
-    """Simple rate limiting middleware"""
+    """Token-bucket rate limiting middleware"""
     
-    def __init__(self, app, calls_per_minute: int = 60):
+    def __init__(self, app, calls_per_minute: int = 60, max_clients: int = 10000):
         super().__init__(app)
         self.calls_per_minute = calls_per_minute
-        self.clients: Dict[str, list] = {}
+        self.refill_rate = calls_per_minute / 60.0
+        self.max_clients = max_clients
+        # client_ip -> (tokens, last_refill), least recently seen first
+        self.clients: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
     
     async def dispatch(self, request: Request, call_next):
         client_ip = request.client.host
-        current_time = time.time()
+        now = time.monotonic()
         
-        # Clean old entries
-        if client_ip in self.clients:
-            self.clients[client_ip] = [
-                timestamp for timestamp in self.clients[client_ip]
-                if current_time - timestamp < 60
-            ]
-        else:
-            self.clients[client_ip] = []
+        # Refill bucket based on elapsed time
+        tokens, last = self.clients.get(client_ip, (self.calls_per_minute, now))
+        tokens = min(self.calls_per_minute, tokens + (now - last) * self.refill_rate)
         
         # Check rate limit
-        if len(self.clients[client_ip]) >= self.calls_per_minute:
+        if tokens < 1:
+            self.clients[client_ip] = (tokens, now)
+            self.clients.move_to_end(client_ip)
             return Response(
                 content="Rate limit exceeded",
                 status_code=429,
                 headers={"Retry-After": "60"}
             )
         
-        # Add current request
-        self.clients[client_ip].append(current_time)
+        # Consume a token for the current request
+        self.clients[client_ip] = (tokens - 1, now)
+        self.clients.move_to_end(client_ip)
+        
+        # Evict least recently seen clients to bound memory
+        if len(self.clients) > self.max_clients:
+            self.clients.popitem(last=False)
         
         response = await call_next(request)
         return response
@@ -45,26 +51,25 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
 class PrometheusMiddleware(BaseHTTPMiddleware):
     """Mock Prometheus metrics middleware"""
     
-    def __init__(self, app):
+    def __init__(self, app, debug_headers: bool = False):
         super().__init__(app)
+        self.debug_headers = debug_headers
         self.request_count = 0
-        self.request_duration = []
+        # Keep only last 1000 requests
+        self.request_duration = deque(maxlen=1000)
     
     async def dispatch(self, request: Request, call_next):
-        start_time = time.time()
+        start_time = time.perf_counter()
         
         response = await call_next(request)
         
-        duration = time.time() - start_time
+        duration = time.perf_counter() - start_time
         self.request_count += 1
         self.request_duration.append(duration)
         
-        # Keep only last 1000 requests
-        if len(self.request_duration) > 1000:
-            self.request_duration = self.request_duration[-1000:]
-        
         # Add metrics headers
         response.headers["X-Request-Count"] = str(self.request_count)
-        response.headers["X-Request-Duration"] = f"{duration:.3f}"
+        if self.debug_headers:
+            response.headers["X-Request-Duration"] = f"{duration:.3f}"
         
         return response
\ No newline at end of file
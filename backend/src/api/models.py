@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 from uuid import UUID
@@ -45,8 +45,7 @@ class DeviceResponse(DeviceBase):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, extra="forbid", frozen=True)
 
 class DeviceFingerprint(BaseModel):
     device_id: UUID
@@ -71,8 +70,7 @@ class AlertResponse(AlertBase):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, extra="forbid", frozen=True)
 
 # Vulnerability models
 class VulnerabilityBase(BaseModel):
@@ -89,5 +87,4 @@ class VulnerabilityResponse(VulnerabilityBase):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        from_attributes = True
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True, extra="forbid", frozen=True)
\ No newline at end of file
@@ -1,17 +1,19 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Response
+from fastapi.responses import ORJSONResponse
+from fastapi.encoders import jsonable_encoder
 from typing import List, Optional
 from uuid import UUID, uuid4
-import asyncio
 from datetime import datetime, timedelta
 import random
+import orjson
+from bisect import bisect_left
+from functools import lru_cache
 
-from ..models import (
-    DeviceResponse, DeviceCreate, DeviceUpdate, DeviceFingerprint,
-    PaginationParams, PaginatedResponse
-)
-from ...detection_engine.fingerprinter import DeviceFingerprinter
+from ..models import DeviceFingerprint
+from ...tasks.device_tasks import scan_device_task
 from ...utils.logger import setup_logger
 from ...utils.metrics import METRICS
+from ...utils.ttl_cache import TTLCache
 
 logger = setup_logger(__name__)
 router = APIRouter()
@@ -100,7 +102,112 @@ MOCK_DEVICES = [
     }
 ]
 
-@router.get("/", response_model=PaginatedResponse)
+# Lookup index so detail endpoints avoid scanning MOCK_DEVICES
+MOCK_DEVICES_BY_ID = {d["id"]: d for d in MOCK_DEVICES}
+
+# JSON-ready device payloads, encoded once instead of on every response
+ENCODED_DEVICES_BY_ID = {d["id"]: jsonable_encoder(d) for d in MOCK_DEVICES}
+
+def _positions_by(field: str) -> dict:
+    """Map each value of a device field to the positions holding it"""
+    index = {}
+    for position, device in enumerate(MOCK_DEVICES):
+        index.setdefault(device[field], set()).add(position)
+    return index
+
+# Device positions bucketed by the exact-match list filters
+_POSITIONS_BY_TYPE = _positions_by("device_type")
+_POSITIONS_BY_VENDOR = _positions_by("vendor")
+_POSITIONS_BY_STATUS = _positions_by("status")
+
+# Device positions sorted by risk score, for bisecting on risk_threshold
+_RISK_ORDER = sorted(range(len(MOCK_DEVICES)), key=lambda i: MOCK_DEVICES[i]["risk_score"])
+_RISK_SCORES = [MOCK_DEVICES[i]["risk_score"] for i in _RISK_ORDER]
+
+# Mock alert and vulnerability templates, aged relative to startup
+_STARTUP_TIME = datetime.utcnow()
+
+MOCK_ALERT_TEMPLATES = (
+    {
+        "title": "Unusual Network Activity",
+        "description": "Device showing abnormal traffic patterns",
+        "severity": "medium",
+        "alert_type": "anomaly",
+        "status": "open",
+        "age": timedelta(hours=2)
+    },
+    {
+        "title": "Firmware Vulnerability",
+        "description": "Outdated firmware version detected",
+        "severity": "high",
+        "alert_type": "vulnerability",
+        "status": "open",
+        "age": timedelta(days=1)
+    }
+)
+
+MOCK_VULNERABILITY_TEMPLATES = (
+    {
+        "cve_id": "CVE-2023-1234",
+        "title": "Buffer Overflow in Web Interface",
+        "description": "A buffer overflow vulnerability exists in the web management interface",
+        "cvss_score": 7.5,
+        "severity": "high",
+        "status": "open",
+        "age": timedelta(days=5)
+    },
+    {
+        "cve_id": "CVE-2023-5678",
+        "title": "Weak Default Credentials",
+        "description": "Device uses weak default credentials",
+        "cvss_score": 5.3,
+        "severity": "medium",
+        "status": "open",
+        "age": timedelta(days=10)
+    }
+)
+
+def _build_mock_records(device_id: UUID, templates: tuple) -> List[dict]:
+    """Materialize mock records for a device from templates"""
+    records = []
+    for template in templates:
+        fields = {key: value for key, value in template.items() if key != "age"}
+        timestamp = _STARTUP_TIME - template["age"]
+        records.append({
+            "id": uuid4(),
+            "device_id": device_id,
+            **fields,
+            "created_at": timestamp,
+            "updated_at": timestamp
+        })
+    return records
+
+MOCK_ALERTS_BY_DEVICE = {
+    d["id"]: _build_mock_records(d["id"], MOCK_ALERT_TEMPLATES) for d in MOCK_DEVICES
+}
+MOCK_VULNERABILITIES_BY_DEVICE = {
+    d["id"]: _build_mock_records(d["id"], MOCK_VULNERABILITY_TEMPLATES) for d in MOCK_DEVICES
+}
+
+# Hourly offsets for the traffic timeline, oldest first (up to one week)
+TRAFFIC_HOUR_OFFSETS = [timedelta(hours=i) for i in range(168, 0, -1)]
+HOURLY_BYTES_RANGE = range(10000, 100001)
+HOURLY_PACKETS_RANGE = range(100, 1001)
+
+# Dashboards poll the device list; identical queries share an encoded body briefly
+_LIST_CACHE = TTLCache(ttl=3.0)
+
+# Traffic aggregates change slowly, so encoded bodies are reused per window
+_TRAFFIC_CACHE = TTLCache(ttl=5.0)
+
+@lru_cache(maxsize=1)
+def get_fingerprinter():
+    """Shared device fingerprinter, created on first use"""
+    from ...detection_engine.fingerprinter import DeviceFingerprinter
+    
+    return DeviceFingerprinter()
+
+@router.get("/")
 async def list_devices(
     page: int = Query(1, ge=1),
     size: int = Query(50, ge=1, le=1000),
@@ -112,20 +219,32 @@ async def list_devices(
 ):
     """List devices with filtering and pagination"""
     
-    # Filter devices based on query parameters
-    filtered_devices = MOCK_DEVICES.copy()
-    
-    if device_type:
-        filtered_devices = [d for d in filtered_devices if d["device_type"] == device_type]
-    
-    if vendor:
-        filtered_devices = [d for d in filtered_devices if d["vendor"] == vendor]
-    
-    if status:
-        filtered_devices = [d for d in filtered_devices if d["status"] == status]
+    cache_key = (page, size, device_type, vendor, status, risk_threshold, search)
+    cached = _LIST_CACHE.get(cache_key)
+    if cached is not None:
+        total, body = cached
+        METRICS.update_device_count(total)
+        return Response(content=body, media_type="application/json")
     
+    # Narrow candidate positions using the precomputed indexes
+    candidates = None
     if risk_threshold is not None:
-        filtered_devices = [d for d in filtered_devices if d["risk_score"] >= risk_threshold]
+        cut = bisect_left(_RISK_SCORES, risk_threshold)
+        candidates = set(_RISK_ORDER[cut:])
+    
+    for positions_by_value, value in (
+        (_POSITIONS_BY_TYPE, device_type),
+        (_POSITIONS_BY_VENDOR, vendor),
+        (_POSITIONS_BY_STATUS, status)
+    ):
+        if value:
+            matches = positions_by_value.get(value, set())
+            candidates = matches if candidates is None else candidates & matches
+    
+    if candidates is None:
+        filtered_devices = MOCK_DEVICES
+    else:
+        filtered_devices = [MOCK_DEVICES[i] for i in sorted(candidates)]
     
     if search:
         search_lower = search.lower()
@@ -146,36 +265,38 @@ async def list_devices(
     # Update metrics
     METRICS.update_device_count(total)
     
-    return PaginatedResponse(
-        items=paginated_devices,
-        total=total,
-        page=page,
-        size=size
-    )
+    body = orjson.dumps({
+        "items": [ENCODED_DEVICES_BY_ID[d["id"]] for d in paginated_devices],
+        "total": total,
+        "page": page,
+        "size": size
+    })
+    _LIST_CACHE.set(cache_key, (total, body))
+    
+    return Response(content=body, media_type="application/json")
 
 @router.get("/{device_id}")
 async def get_device(device_id: UUID):
     """Get device details by ID"""
     
-    device = next((d for d in MOCK_DEVICES if d["id"] == device_id), None)
+    device = MOCK_DEVICES_BY_ID.get(device_id)
     
     if not device:
         raise HTTPException(status_code=404, detail="Device not found")
     
-    return device
+    return ENCODED_DEVICES_BY_ID[device_id]
 
 @router.post("/{device_id}/fingerprint", response_model=DeviceFingerprint)
 async def fingerprint_device(device_id: UUID):
     """Re-fingerprint a specific device"""
     
-    device = next((d for d in MOCK_DEVICES if d["id"] == device_id), None)
+    device = MOCK_DEVICES_BY_ID.get(device_id)
     
     if not device:
         raise HTTPException(status_code=404, detail="Device not found")
     
     try:
-        # Initialize fingerprinter
-        fingerprinter = DeviceFingerprinter()
+        fingerprinter = get_fingerprinter()
         
         # Mock fingerprinting process
         fingerprint_result = await fingerprinter.fingerprint_device(device["ip_address"])
@@ -208,48 +329,25 @@ async def get_device_alerts(
 ):
     """Get alerts for a specific device"""
     
-    device = next((d for d in MOCK_DEVICES if d["id"] == device_id), None)
+    device = MOCK_DEVICES_BY_ID.get(device_id)
     
     if not device:
         raise HTTPException(status_code=404, detail="Device not found")
     
     # Mock alerts data
-    mock_alerts = [
-        {
-            "id": uuid4(),
-            "device_id": device_id,
-            "title": "Unusual Network Activity",
-            "description": "Device showing abnormal traffic patterns",
-            "severity": "medium",
-            "alert_type": "anomaly",
-            "status": "open",
-            "created_at": datetime.utcnow() - timedelta(hours=2),
-            "updated_at": datetime.utcnow() - timedelta(hours=2)
-        },
-        {
-            "id": uuid4(),
-            "device_id": device_id,
-            "title": "Firmware Vulnerability",
-            "description": "Outdated firmware version detected",
-            "severity": "high",
-            "alert_type": "vulnerability",
-            "status": "open",
-            "created_at": datetime.utcnow() - timedelta(days=1),
-            "updated_at": datetime.utcnow() - timedelta(days=1)
-        }
-    ]
+    mock_alerts = MOCK_ALERTS_BY_DEVICE[device_id]
     
     total = len(mock_alerts)
     start_idx = (page - 1) * size
     end_idx = start_idx + size
     paginated_alerts = mock_alerts[start_idx:end_idx]
     
-    return PaginatedResponse(
-        items=paginated_alerts,
-        total=total,
-        page=page,
-        size=size
-    )
+    return ORJSONResponse({
+        "items": paginated_alerts,
+        "total": total,
+        "page": page,
+        "size": size
+    })
 
 @router.get("/{device_id}/vulnerabilities")
 async def get_device_vulnerabilities(
@@ -259,50 +357,25 @@ async def get_device_vulnerabilities(
 ):
     """Get vulnerabilities for a specific device"""
     
-    device = next((d for d in MOCK_DEVICES if d["id"] == device_id), None)
+    device = MOCK_DEVICES_BY_ID.get(device_id)
     
     if not device:
         raise HTTPException(status_code=404, detail="Device not found")
     
     # Mock vulnerabilities data
-    mock_vulnerabilities = [
-        {
-            "id": uuid4(),
-            "device_id": device_id,
-            "cve_id": "CVE-2023-1234",
-            "title": "Buffer Overflow in Web Interface",
-            "description": "A buffer overflow vulnerability exists in the web management interface",
-            "cvss_score": 7.5,
-            "severity": "high",
-            "status": "open",
-            "created_at": datetime.utcnow() - timedelta(days=5),
-            "updated_at": datetime.utcnow() - timedelta(days=5)
-        },
-        {
-            "id": uuid4(),
-            "device_id": device_id,
-            "cve_id": "CVE-2023-5678",
-            "title": "Weak Default Credentials",
-            "description": "Device uses weak default credentials",
-            "cvss_score": 5.3,
-            "severity": "medium",
-            "status": "open",
-            "created_at": datetime.utcnow() - timedelta(days=10),
-            "updated_at": datetime.utcnow() - timedelta(days=10)
-        }
-    ]
+    mock_vulnerabilities = MOCK_VULNERABILITIES_BY_DEVICE[device_id]
     
     total = len(mock_vulnerabilities)
     start_idx = (page - 1) * size
     end_idx = start_idx + size
     paginated_vulns = mock_vulnerabilities[start_idx:end_idx]
     
-    return PaginatedResponse(
-        items=paginated_vulns,
-        total=total,
-        page=page,
-        size=size
-    )
+    return ORJSONResponse({
+        "items": paginated_vulns,
+        "total": total,
+        "page": page,
+        "size": size
+    })
 
 @router.get("/{device_id}/traffic")
 async def get_device_traffic(
@@ -311,12 +384,22 @@ async def get_device_traffic(
 ):
     """Get network traffic patterns for a device"""
     
-    device = next((d for d in MOCK_DEVICES if d["id"] == device_id), None)
+    device = MOCK_DEVICES_BY_ID.get(device_id)
     
     if not device:
         raise HTTPException(status_code=404, detail="Device not found")
     
-    # Mock traffic data
+    cache_key = (device_id, hours)
+    body = _TRAFFIC_CACHE.get(cache_key)
+    if body is not None:
+        return Response(content=body, media_type="application/json")
+    
+    # Mock traffic data, with hourly values drawn in bulk
+    now = datetime.utcnow()
+    window = TRAFFIC_HOUR_OFFSETS[-hours:]
+    hourly_bytes = random.choices(HOURLY_BYTES_RANGE, k=hours)
+    hourly_packets = random.choices(HOURLY_PACKETS_RANGE, k=hours)
+    hourly_anomaly_scores = [random.random() * 0.3 for _ in range(hours)]
     traffic_data = {
         "device_id": str(device_id),
         "time_range_hours": hours,
@@ -330,29 +413,31 @@ async def get_device_traffic(
         },
         "hourly_stats": [
             {
-                "timestamp": (datetime.utcnow() - timedelta(hours=i)).isoformat(),
-                "bytes": random.randint(10000, 100000),
-                "packets": random.randint(100, 1000),
-                "anomaly_score": random.uniform(0, 0.3)
+                "timestamp": (now - offset).isoformat(),
+                "bytes": hour_bytes,
+                "packets": hour_packets,
+                "anomaly_score": hour_anomaly_score
             }
-            for i in range(hours, 0, -1)
+            for offset, hour_bytes, hour_packets, hour_anomaly_score in zip(
+                window, hourly_bytes, hourly_packets, hourly_anomaly_scores
+            )
         ]
     }
+    body = orjson.dumps(traffic_data)
+    _TRAFFIC_CACHE.set(cache_key, body)
     
-    return traffic_data
+    return Response(content=body, media_type="application/json")
 
 @router.post("/{device_id}/scan")
 async def scan_device(device_id: UUID):
     """Trigger security scan for a device"""
     
-    device = next((d for d in MOCK_DEVICES if d["id"] == device_id), None)
+    device = MOCK_DEVICES_BY_ID.get(device_id)
     
     if not device:
         raise HTTPException(status_code=404, detail="Device not found")
     
     # Mock scan task
-    from ...tasks.device_tasks import scan_device_task
-    
     task = scan_device_task.delay(str(device_id))
     
     logger.info(f"Security scan initiated for device {device_id}")
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, Float, Text, ForeignKey, Integer, JSON
+from sqlalchemy import Column, String, DateTime, Float, Text, ForeignKey, Integer, JSON, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
@@ -29,6 +29,12 @@ class Device(Base):
     alerts = relationship("Alert", back_populates="device", cascade="all, delete-orphan")
     vulnerabilities = relationship("Vulnerability", back_populates="device", cascade="all, delete-orphan")
 
+# Composite indexes for filtered device listings sorted by last_seen
+Index("idx_devices_status_last_seen", Device.status, Device.last_seen.desc())
+Index("idx_devices_type_last_seen", Device.device_type, Device.last_seen.desc())
+Index("idx_devices_vendor_last_seen", Device.vendor, Device.last_seen.desc())
+Index("idx_devices_high_risk", Device.risk_score, postgresql_where=Device.risk_score >= 0.5)
+
 class Alert(Base):
     __tablename__ = "alerts"
     
@@ -39,13 +45,16 @@ class Alert(Base):
     severity = Column(String(20), default="medium")
     alert_type = Column(String(50), default="anomaly")
     status = Column(String(20), default="open")
-    metadata = Column(JSON)
+    metadata_ = Column("metadata", JSON)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Relationships
     device = relationship("Device", back_populates="alerts")
 
+# Partial index for the open-alert triage query
+Index("idx_alerts_open", Alert.device_id, postgresql_where=Alert.status == "open")
+
 class Vulnerability(Base):
     __tablename__ = "vulnerabilities"
     
@@ -57,7 +66,7 @@ class Vulnerability(Base):
     cvss_score = Column(Float, default=0.0)
     severity = Column(String(20), default="medium")
     status = Column(String(20), default="open")
-    metadata = Column(JSON)
+    metadata_ = Column("metadata", JSON)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
@@ -1,13 +1,26 @@
 import asyncio
 import random
+from functools import lru_cache
 from typing import Dict, Any
 from ..utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+@lru_cache(maxsize=4096)
+def _fnv1a(value: str) -> int:
+    """32-bit FNV-1a hash, stable across processes unlike hash()"""
+    h = 2166136261
+    for byte in value.encode():
+        h = ((h ^ byte) * 16777619) & 0xFFFFFFFF
+    return h
+
 class DeviceFingerprinter:
     """Mock device fingerprinter for development"""
     
+    # Candidates for unknown addresses, built once instead of per call
+    DEVICE_TYPES = ("Smart Camera", "Smart Thermostat", "Smart Speaker", "Smart Light", "Smart Lock", "Router", "Printer")
+    VENDORS = ("Hikvision", "Nest", "Amazon", "Philips", "August", "TP-Link", "HP")
+    
     def __init__(self):
         self.device_signatures = {
             "192.168.1.100": {"device_type": "Smart Camera", "vendor": "Hikvision", "confidence": 0.95},
@@ -28,12 +41,9 @@ class DeviceFingerprinter:
         if ip_address in self.device_signatures:
             base_data = self.device_signatures[ip_address]
         else:
-            device_types = ["Smart Camera", "Smart Thermostat", "Smart Speaker", "Smart Light", "Smart Lock", "Router", "Printer"]
-            vendors = ["Hikvision", "Nest", "Amazon", "Philips", "August", "TP-Link", "HP"]
-            
             base_data = {
-                "device_type": random.choice(device_types),
-                "vendor": random.choice(vendors),
+                "device_type": random.choice(self.DEVICE_TYPES),
+                "vendor": random.choice(self.VENDORS),
                 "confidence": random.uniform(0.7, 0.98)
             }
         
@@ -44,7 +54,7 @@ class DeviceFingerprinter:
                 "options": [1, 3, 6, 15, 26, 28, 51, 58, 59]
             },
             "tls_fingerprint": {
-                "ja3_hash": f"mock_ja3_{hash(ip_address) % 10000}",
+                "ja3_hash": f"mock_ja3_{_fnv1a(ip_address) % 10000}",
                 "cipher_suites": ["TLS_AES_256_GCM_SHA384", "TLS_CHACHA20_POLY1305_SHA256"]
             },
             "http_fingerprint": {
@@ -1,8 +1,13 @@
-import redis
-import json
-import pickle
-from typing import Any, Optional, Union
+from redis.asyncio import ConnectionPool, Redis
+from redis.exceptions import ConnectionError as RedisConnectionError, TimeoutError as RedisTimeoutError
+import asyncio
+import msgpack
+import time
+import zlib
+from typing import Any, Dict, List, Optional
 import os
+from datetime import datetime, timezone
+from uuid import UUID
 from .logger import setup_logger
 
 logger = setup_logger(__name__)
@@ -10,29 +15,107 @@ logger = setup_logger(__name__)
 # Redis connection
 REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
 
-try:
-    redis_client = redis.from_url(REDIS_URL, decode_responses=False)
-    redis_client.ping()
-    logger.info("Redis connection established")
-except Exception as e:
-    logger.error(f"Redis connection failed: {e}")
-    redis_client = None
+REDIS_POOL_SIZE = int(os.getenv("REDIS_POOL_SIZE", "64"))
+
+# Short socket timeouts make a stalled or blackholed Redis fail fast, so
+# the circuit breaker below can trip instead of requests hanging
+REDIS_CONNECT_TIMEOUT = float(os.getenv("REDIS_CONNECT_TIMEOUT", "0.5"))
+REDIS_SOCKET_TIMEOUT = float(os.getenv("REDIS_SOCKET_TIMEOUT", "1.0"))
+
+# One bounded pool shared by every caller in the process; connections are
+# opened lazily and reused, so concurrent requests never storm Redis
+pool = ConnectionPool.from_url(
+    REDIS_URL,
+    max_connections=REDIS_POOL_SIZE,
+    decode_responses=False,
+    health_check_interval=30,
+    socket_connect_timeout=REDIS_CONNECT_TIMEOUT,
+    socket_timeout=REDIS_SOCKET_TIMEOUT
+)
+redis_client = Redis(connection_pool=pool)
+
+# Fire-and-forget writes are flushed in pipelines of up to this many
+# commands, after waiting briefly for more to accumulate
+WRITE_BATCH_SIZE = 256
+WRITE_FLUSH_INTERVAL = 0.01
+WRITE_QUEUE_SIZE = 10000
+_STOP_WRITER = object()
+
+# Only failures to reach Redis count towards the breaker; command errors
+# such as WRONGTYPE mean the server is up
+CONNECTIVITY_ERRORS = (RedisConnectionError, RedisTimeoutError, OSError)
+
+# After this many consecutive failed calls the cache stops touching the
+# network for a cooldown period instead of failing every request
+CIRCUIT_FAILURE_THRESHOLD = 5
+CIRCUIT_COOLDOWN = 30.0
+
+# Payloads above this size are stored compressed; every stored value
+# carries a one-byte prefix saying which form it is in
+COMPRESS_THRESHOLD = 1024
+_RAW = b"R"
+_COMPRESSED = b"Z"
+
+def _encode_extra(value: Any) -> Any:
+    """msgpack fallback for the types API payloads carry"""
+    if isinstance(value, UUID):
+        return str(value)
+    # The app's timestamps come from utcnow(), so naive means UTC
+    if isinstance(value, datetime) and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    raise TypeError(f"Cannot serialize {type(value).__name__} for cache")
+
+def _pack(value: Any) -> bytes:
+    blob = msgpack.packb(value, use_bin_type=True, datetime=True, default=_encode_extra)
+    if len(blob) > COMPRESS_THRESHOLD:
+        return _COMPRESSED + zlib.compress(blob, 3)
+    return _RAW + blob
+
+def _unpack(value: bytes) -> Any:
+    prefix, blob = value[:1], value[1:]
+    if prefix == _COMPRESSED:
+        blob = zlib.decompress(blob)
+    elif prefix != _RAW:
+        # Legacy pickle entries are never unpickled; treat them as misses
+        return None
+    return msgpack.unpackb(blob, raw=False, timestamp=3)
 
 class Cache:
     """Redis cache wrapper"""
     
     def __init__(self):
         self.client = redis_client
+        self._write_queue: Optional[asyncio.Queue] = None
+        self._writer: Optional[asyncio.Task] = None
+        self._failures = 0
+        self._open_until = 0.0
+    
+    def _available(self) -> bool:
+        return self.client is not None and time.monotonic() >= self._open_until
+    
+    async def _exec(self, fn, *args, **kwargs):
+        """Await a Redis call, tripping the circuit breaker on repeated failures"""
+        try:
+            result = await fn(*args, **kwargs)
+        except CONNECTIVITY_ERRORS:
+            self._failures += 1
+            if self._failures >= CIRCUIT_FAILURE_THRESHOLD:
+                self._open_until = time.monotonic() + CIRCUIT_COOLDOWN
+                if self._failures == CIRCUIT_FAILURE_THRESHOLD:
+                    logger.warning(f"Redis unavailable, bypassing cache for {CIRCUIT_COOLDOWN}s")
+            raise
+        self._failures = 0
+        return result
     
     async def get(self, key: str) -> Optional[Any]:
         """Get value from cache"""
-        if not self.client:
+        if not self._available():
             return None
         
         try:
-            value = self.client.get(key)
+            value = await self._exec(self.client.get, key)
             if value:
-                return pickle.loads(value)
+                return _unpack(value)
             return None
         except Exception as e:
             logger.error(f"Cache get error for key {key}: {e}")
@@ -40,59 +123,193 @@ class Cache:
     
     async def set(self, key: str, value: Any, expire: int = 3600) -> bool:
         """Set value in cache with expiration"""
-        if not self.client:
+        if not self._available():
             return False
         
         try:
-            serialized_value = pickle.dumps(value)
-            return self.client.setex(key, expire, serialized_value)
+            serialized_value = _pack(value)
+            return await self._exec(self.client.setex, key, expire, serialized_value)
         except Exception as e:
             logger.error(f"Cache set error for key {key}: {e}")
             return False
     
-    async def delete(self, key: str) -> bool:
-        """Delete key from cache"""
-        if not self.client:
+    async def mget(self, keys: List[str]) -> List[Optional[Any]]:
+        """Get several values in one round trip"""
+        if not self._available() or not keys:
+            return [None] * len(keys)
+        
+        try:
+            values = await self._exec(self.client.mget, keys)
+            return [_unpack(value) if value else None for value in values]
+        except Exception as e:
+            logger.error(f"Cache mget error for {len(keys)} keys: {e}")
+            return [None] * len(keys)
+    
+    async def mset(self, mapping: Dict[str, Any], expire: int = 3600) -> bool:
+        """Set several values with expiration in one round trip"""
+        if not self._available() or not mapping:
             return False
         
         try:
-            return bool(self.client.delete(key))
+            commands = [("setex", key, expire, _pack(value)) for key, value in mapping.items()]
         except Exception as e:
-            logger.error(f"Cache delete error for key {key}: {e}")
+            logger.error(f"Cache mset error for {len(mapping)} keys: {e}")
             return False
+        
+        results = await self.pipeline(commands)
+        return results is not None and all(results)
     
-    async def exists(self, key: str) -> bool:
-        """Check if key exists in cache"""
-        if not self.client:
-            return False
+    async def pipeline(self, commands: List[tuple]) -> Optional[List[Any]]:
+        """Run (method, *args) commands in one non-transactional round trip
+        
+        Returns the per-command results, or None if the cache is unavailable
+        or the pipeline failed.
+        """
+        if not self._available() or not commands:
+            return None
         
         try:
-            return bool(self.client.exists(key))
+            return await self._exec(self._execute_pipeline, commands)
+        except Exception as e:
+            logger.error(f"Cache pipeline error for {len(commands)} commands: {e}")
+            return None
+    
+    async def _execute_pipeline(self, commands: List[tuple]) -> List[Any]:
+        async with self.client.pipeline(transaction=False) as pipe:
+            for command, *args in commands:
+                getattr(pipe, command)(*args)
+            return await pipe.execute()
+    
+    async def delete(self, key: str) -> int:
+        """Delete key from cache, returning the number of keys removed"""
+        if not self._available():
+            return 0
+        
+        try:
+            return await self._exec(self.client.delete, key)
+        except Exception as e:
+            logger.error(f"Cache delete error for key {key}: {e}")
+            return 0
+    
+    async def exists(self, key: str) -> int:
+        """Check if key exists in cache, returning 1 if it does"""
+        if not self._available():
+            return 0
+        
+        try:
+            return await self._exec(self.client.exists, key)
         except Exception as e:
             logger.error(f"Cache exists error for key {key}: {e}")
-            return False
+            return 0
     
     async def increment(self, key: str, amount: int = 1) -> Optional[int]:
         """Increment counter in cache"""
-        if not self.client:
+        if not self._available():
             return None
         
         try:
-            return self.client.incr(key, amount)
+            return await self._exec(self.client.incr, key, amount)
         except Exception as e:
             logger.error(f"Cache increment error for key {key}: {e}")
             return None
     
-    async def expire(self, key: str, seconds: int) -> bool:
-        """Set expiration for key"""
-        if not self.client:
-            return False
+    async def incr_with_expire(self, key: str, amount: int = 1, ttl: int = 60) -> Optional[int]:
+        """Increment counter and set its TTL if unset, in one round trip"""
+        if not self._available():
+            return None
         
         try:
-            return bool(self.client.expire(key, seconds))
+            async with self.client.pipeline(transaction=False) as pipe:
+                pipe.incr(key, amount)
+                pipe.expire(key, ttl, nx=True)
+                count, _ = await self._exec(pipe.execute)
+            return count
+        except Exception as e:
+            logger.error(f"Cache increment error for key {key}: {e}")
+            return None
+    
+    async def expire(self, key: str, seconds: int) -> int:
+        """Set expiration for key, returning 1 if a timeout was set"""
+        if not self._available():
+            return 0
+        
+        try:
+            return int(await self._exec(self.client.expire, key, seconds))
         except Exception as e:
             logger.error(f"Cache expire error for key {key}: {e}")
-            return False
+            return 0
+    
+    def set_nowait(self, key: str, value: Any, expire: int = 3600):
+        """Queue a set with expiration without waiting for the reply"""
+        try:
+            serialized_value = _pack(value)
+        except Exception as e:
+            logger.error(f"Cache set error for key {key}: {e}")
+            return
+        self._enqueue(("setex", key, expire, serialized_value))
+    
+    def incr_nowait(self, key: str, amount: int = 1):
+        """Queue a counter increment without waiting for the reply"""
+        self._enqueue(("incrby", key, amount))
+    
+    def expire_nowait(self, key: str, seconds: int):
+        """Queue an expiration update without waiting for the reply"""
+        self._enqueue(("expire", key, seconds))
+    
+    def _enqueue(self, command: tuple):
+        if self._write_queue is None:
+            logger.warning(f"Cache writer not running, dropping {command[0]} for key {command[1]}")
+            return
+        try:
+            self._write_queue.put_nowait(command)
+        except asyncio.QueueFull:
+            logger.warning(f"Cache write queue full, dropping {command[0]} for key {command[1]}")
+    
+    def start_writer(self):
+        """Start the background task that flushes queued writes"""
+        if self._writer is None:
+            self._write_queue = asyncio.Queue(maxsize=WRITE_QUEUE_SIZE)
+            self._writer = asyncio.create_task(self._drain_writes(self._write_queue))
+    
+    async def stop_writer(self):
+        """Stop the writer task once every write queued so far is flushed"""
+        if self._writer is None:
+            return
+        queue, writer = self._write_queue, self._writer
+        # Detach first so writes arriving during shutdown are dropped, not stranded
+        self._write_queue = None
+        self._writer = None
+        await queue.put(_STOP_WRITER)
+        await writer
+    
+    async def _drain_writes(self, queue: asyncio.Queue):
+        while True:
+            command = await queue.get()
+            if command is _STOP_WRITER:
+                return
+            batch = [command]
+            await asyncio.sleep(WRITE_FLUSH_INTERVAL)
+            stopping = False
+            while len(batch) < WRITE_BATCH_SIZE and not queue.empty():
+                command = queue.get_nowait()
+                if command is _STOP_WRITER:
+                    stopping = True
+                    break
+                batch.append(command)
+            if await self.pipeline(batch) is None:
+                logger.warning(f"Cache write flush failed, dropping {len(batch)} commands")
+            if stopping:
+                return
 
 # Global cache instance
-cache = Cache()
\ No newline at end of file
+cache = Cache()
+
+async def init_cache():
+    """Start the cache write queue; Redis itself is connected on first use"""
+    cache.start_writer()
+
+async def close_cache():
+    """Flush queued writes and close pooled Redis connections on shutdown"""
+    await cache.stop_writer()
+    await redis_client.aclose()
+    await pool.disconnect()
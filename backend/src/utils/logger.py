@@ -1,7 +1,48 @@
+import atexit
 import logging
+import logging.handlers
+import queue
 import sys
+import threading
 from typing import Optional
 
+# All loggers hand records to one queue; a single listener thread writes
+# them to stdout so console I/O stays off the request path
+_formatter = logging.Formatter(
+    '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+_log_queue = queue.SimpleQueue()
+_console_handler = logging.StreamHandler(sys.stdout)
+_console_handler.setFormatter(_formatter)
+_listener: Optional[logging.handlers.QueueListener] = None
+_listener_lock = threading.Lock()
+
+def _ensure_listener():
+    global _listener
+    if _listener is not None:
+        return
+    with _listener_lock:
+        if _listener is None:
+            _listener = logging.handlers.QueueListener(_log_queue, _console_handler)
+            _listener.start()
+
+def stop_logging():
+    """Flush queued records and stop the console listener thread"""
+    global _listener
+    with _listener_lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+
+atexit.register(stop_logging)
+
+class _ConsoleQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that starts the listener when the first record arrives"""
+    
+    def emit(self, record: logging.LogRecord):
+        _ensure_listener()
+        super().emit(record)
+
 def setup_logger(name: str, level: str = "INFO") -> logging.Logger:
     """Setup logger with consistent formatting"""
     
@@ -13,16 +54,10 @@ def setup_logger(name: str, level: str = "INFO") -> logging.Logger:
     
     logger.setLevel(getattr(logging, level.upper()))
     
-    # Create console handler
-    handler = logging.StreamHandler(sys.stdout)
+    # Queue records for the shared console listener
+    handler = _ConsoleQueueHandler(_log_queue)
     handler.setLevel(getattr(logging, level.upper()))
     
-    # Create formatter
-    formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-    )
-    handler.setFormatter(formatter)
-    
     logger.addHandler(handler)
     
     return logger
\ No newline at end of file
@@ -1,7 +1,11 @@
-from typing import Dict, Any
+from typing import Any, Callable, Dict, Optional
+from collections import deque
 import time
 from datetime import datetime
 
+# Number of recent identifications kept for rolling averages
+WINDOW_SIZE = 1000
+
 class MetricsCollector:
     """Simple metrics collector for development"""
     
@@ -9,10 +13,16 @@ class MetricsCollector:
         self.metrics = {
             "device_count": 0,
             "alert_count": 0,
-            "identification_accuracy": [],
-            "processing_times": [],
-            "start_time": time.time()
+            "identification_accuracy": deque(maxlen=WINDOW_SIZE),
+            "processing_times": deque(maxlen=WINDOW_SIZE),
+            "start_time": time.time(),
+            "db_pool": None
         }
+        # Running sums over the windows so averages are O(1)
+        self._accuracy_sum = 0.0
+        self._processing_time_sum = 0.0
+        # Sampled when metrics are read so the gauges reflect the pool right now
+        self._db_pool_source: Optional[Callable[[], Dict[str, int]]] = None
     
     def update_device_count(self, count: int):
         """Update device count metric"""
@@ -22,28 +32,44 @@ class MetricsCollector:
         """Update alert count metric"""
         self.metrics["alert_count"] = count
     
+    def update_db_pool(self, stats: Dict[str, int]):
+        """Update database connection pool gauges"""
+        self.metrics["db_pool"] = stats
+    
+    def set_db_pool_source(self, source: Callable[[], Dict[str, int]]):
+        """Register a callable that reports connection pool gauges on read"""
+        self._db_pool_source = source
+    
     def record_device_identification(self, accuracy: float, processing_time: float):
         """Record device identification metrics"""
-        self.metrics["identification_accuracy"].append(accuracy)
-        self.metrics["processing_times"].append(processing_time)
+        accuracies = self.metrics["identification_accuracy"]
+        processing_times = self.metrics["processing_times"]
+        
+        # A full deque drops its oldest sample on append
+        if len(accuracies) == WINDOW_SIZE:
+            self._accuracy_sum -= accuracies[0]
+        if len(processing_times) == WINDOW_SIZE:
+            self._processing_time_sum -= processing_times[0]
         
-        # Keep only last 1000 records
-        if len(self.metrics["identification_accuracy"]) > 1000:
-            self.metrics["identification_accuracy"] = self.metrics["identification_accuracy"][-1000:]
-        if len(self.metrics["processing_times"]) > 1000:
-            self.metrics["processing_times"] = self.metrics["processing_times"][-1000:]
+        accuracies.append(accuracy)
+        processing_times.append(processing_time)
+        self._accuracy_sum += accuracy
+        self._processing_time_sum += processing_time
     
     def get_metrics(self) -> Dict[str, Any]:
         """Get current metrics"""
-        uptime = time.time() - self.metrics["start_time"]
+        now = time.time()
+        if self._db_pool_source is not None:
+            self.update_db_pool(self._db_pool_source())
+        uptime = now - self.metrics["start_time"]
         
         avg_accuracy = 0.0
         if self.metrics["identification_accuracy"]:
-            avg_accuracy = sum(self.metrics["identification_accuracy"]) / len(self.metrics["identification_accuracy"])
+            avg_accuracy = self._accuracy_sum / len(self.metrics["identification_accuracy"])
         
         avg_processing_time = 0.0
         if self.metrics["processing_times"]:
-            avg_processing_time = sum(self.metrics["processing_times"]) / len(self.metrics["processing_times"])
+            avg_processing_time = self._processing_time_sum / len(self.metrics["processing_times"])
         
         return {
             "device_count": self.metrics["device_count"],
@@ -51,7 +77,8 @@ class MetricsCollector:
             "avg_identification_accuracy": round(avg_accuracy, 3),
             "avg_processing_time": round(avg_processing_time, 3),
             "uptime_seconds": round(uptime, 1),
-            "timestamp": datetime.utcnow().isoformat()
+            "db_pool": self.metrics["db_pool"],
+            "timestamp": datetime.utcfromtimestamp(now).isoformat()
         }
 
 # Global metrics instance
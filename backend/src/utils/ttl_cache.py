@@ -0,0 +1,48 @@
+import time
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+class TTLCache:
+    """In-process cache with per-entry expiration"""
+    
+    def __init__(self, ttl: float = 3.0, maxsize: int = 1024):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+    
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Get value if present and not expired"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        return value
+    
+    def set(self, key: Hashable, value: Any):
+        """Store value for ttl seconds, evicting the oldest entry when full"""
+        now = time.monotonic()
+        # Re-inserting keeps dict order equal to expiry order, since every
+        # entry shares the same ttl
+        self._entries.pop(key, None)
+        self._purge_expired(now)
+        if len(self._entries) >= self.maxsize:
+            self._entries.pop(next(iter(self._entries)))
+        self._entries[key] = (now + self.ttl, value)
+    
+    def _purge_expired(self, now: float):
+        entries = self._entries
+        while entries:
+            oldest = next(iter(entries))
+            if entries[oldest][0] >= now:
+                break
+            del entries[oldest]
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def clear(self):
+        """Drop all entries"""
+        self._entries.clear()
@@ -0,0 +1,39 @@
+import asyncio
+
+import pytest
+from fastapi import WebSocketDisconnect
+
+from src.api.main import ConnectionManager
+
+
+class FakeSocket:
+    def __init__(self, error=None):
+        self.error = error
+        self.sent = []
+
+    async def send_text(self, text):
+        if self.error is not None:
+            raise self.error
+        self.sent.append(text)
+
+
+def test_broadcast_prunes_disconnected_clients():
+    manager = ConnectionManager()
+    live, gone = FakeSocket(), FakeSocket(WebSocketDisconnect())
+    manager.active_connections.update((live, gone))
+
+    asyncio.run(manager.broadcast({"type": "heartbeat"}))
+
+    assert manager.active_connections == {live}
+    assert live.sent == ['{"type":"heartbeat"}']
+
+
+def test_broadcast_prunes_before_propagating_unexpected_errors():
+    manager = ConnectionManager()
+    broken, gone = FakeSocket(ValueError("boom")), FakeSocket(RuntimeError())
+    manager.active_connections.update((broken, gone))
+
+    with pytest.raises(ValueError):
+        asyncio.run(manager.broadcast({"type": "heartbeat"}))
+
+    assert manager.active_connections == {broken}
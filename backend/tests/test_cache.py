@@ -0,0 +1,230 @@
+import asyncio
+import pickle
+from datetime import datetime, timezone
+from uuid import uuid4
+
+from redis.exceptions import ResponseError
+
+from src.api.routes.devices import MOCK_DEVICES
+from src.utils.cache import CIRCUIT_COOLDOWN, CIRCUIT_FAILURE_THRESHOLD, Cache, _pack, _unpack
+
+
+def test_round_trips_uuid_and_naive_datetime_payloads():
+    device = MOCK_DEVICES[0]
+    expected = {
+        key: value.replace(tzinfo=timezone.utc) if isinstance(value, datetime) else value
+        for key, value in device.items()
+    }
+    expected["id"] = str(device["id"])
+    assert _unpack(_pack(device)) == expected
+
+
+def test_round_trips_aware_datetime_unchanged():
+    value = {"at": datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc), "id": uuid4()}
+    restored = _unpack(_pack(value))
+    assert restored["at"] == value["at"]
+    assert restored["id"] == str(value["id"])
+
+
+def test_large_payloads_are_compressed():
+    value = {"blob": "x" * 5000}
+    packed = _pack(value)
+    assert packed[:1] == b"Z"
+    assert len(packed) < 5000
+    assert _unpack(packed) == value
+
+
+def test_legacy_pickle_entries_read_as_misses():
+    assert _unpack(pickle.dumps({"a": 1})) is None
+
+
+class FakePipeline:
+    def __init__(self, client):
+        self.client = client
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def __getattr__(self, name):
+        return lambda *args: self.commands.append((name,) + args)
+
+    async def execute(self):
+        if self.client.error is not None:
+            raise self.client.error
+        self.client.executed.append(self.commands)
+        return [True] * len(self.commands)
+
+
+class FakeRedis:
+    def __init__(self, error=None):
+        self.error = error
+        self.executed = []
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+def test_pipeline_runs_commands_in_one_batch():
+    cache = Cache()
+    cache.client = FakeRedis()
+
+    results = asyncio.run(cache.pipeline([("incrby", "a", 1), ("expire", "a", 60)]))
+
+    assert results == [True, True]
+    assert cache.client.executed == [[("incrby", "a", 1), ("expire", "a", 60)]]
+
+
+def test_pipeline_returns_none_when_cache_unavailable():
+    cache = Cache()
+    cache.client = None
+    assert asyncio.run(cache.pipeline([("incrby", "a", 1)])) is None
+
+
+def test_pipeline_failures_count_towards_the_breaker():
+    cache = Cache()
+    cache.client = FakeRedis(error=ConnectionError("down"))
+
+    assert asyncio.run(cache.pipeline([("incrby", "a", 1)])) is None
+    assert cache._failures == 1
+
+
+def test_stop_writer_flushes_writes_taken_off_the_queue():
+    async def scenario():
+        cache = Cache()
+        cache.client = FakeRedis()
+        cache.start_writer()
+        cache.incr_nowait("a")
+        await asyncio.sleep(0)  # writer takes "a" and waits for more
+        cache.incr_nowait("b")
+        await cache.stop_writer()
+        return cache.client.executed
+
+    assert asyncio.run(scenario()) == [[("incrby", "a", 1), ("incrby", "b", 1)]]
+
+
+def test_writes_without_a_running_writer_are_logged(caplog):
+    cache = Cache()
+    cache.incr_nowait("a")
+    assert "dropping incrby for key a" in caplog.text
+
+
+def test_set_nowait_logs_unserializable_values(caplog):
+    async def scenario():
+        cache = Cache()
+        cache.client = FakeRedis()
+        cache.start_writer()
+        cache.set_nowait("a", object())
+        await cache.stop_writer()
+        return cache.client.executed
+
+    assert asyncio.run(scenario()) == []
+    assert "Cache set error for key a" in caplog.text
+
+
+def test_writes_dropped_while_breaker_is_open_are_logged(caplog):
+    async def scenario():
+        cache = Cache()
+        cache.client = FakeRedis()
+        cache._open_until = float("inf")
+        cache.start_writer()
+        cache.incr_nowait("a")
+        cache.incr_nowait("b")
+        await cache.stop_writer()
+        return cache.client.executed
+
+    assert asyncio.run(scenario()) == []
+    assert "Cache write flush failed, dropping 2 commands" in caplog.text
+
+
+class FlakyRedis:
+    def __init__(self):
+        self.down = True
+        self.calls = 0
+
+    async def get(self, key):
+        self.calls += 1
+        if self.down:
+            raise ConnectionError("down")
+        return _pack("value")
+
+
+def test_breaker_trips_after_consecutive_failures(clock):
+    cache = Cache()
+    cache.client = FlakyRedis()
+
+    for _ in range(CIRCUIT_FAILURE_THRESHOLD):
+        assert asyncio.run(cache.get("k")) is None
+    assert cache.client.calls == CIRCUIT_FAILURE_THRESHOLD
+
+    assert asyncio.run(cache.get("k")) is None
+    assert cache.client.calls == CIRCUIT_FAILURE_THRESHOLD
+
+
+def test_breaker_stays_open_for_the_cooldown(clock):
+    cache = Cache()
+    cache.client = FlakyRedis()
+    for _ in range(CIRCUIT_FAILURE_THRESHOLD):
+        asyncio.run(cache.get("k"))
+
+    clock.now += CIRCUIT_COOLDOWN - 0.1
+    cache.client.down = False
+    assert asyncio.run(cache.get("k")) is None
+    assert cache.client.calls == CIRCUIT_FAILURE_THRESHOLD
+
+
+def test_half_open_success_closes_the_breaker(clock):
+    cache = Cache()
+    cache.client = FlakyRedis()
+    for _ in range(CIRCUIT_FAILURE_THRESHOLD):
+        asyncio.run(cache.get("k"))
+
+    clock.now += CIRCUIT_COOLDOWN
+    cache.client.down = False
+    assert asyncio.run(cache.get("k")) == "value"
+    assert cache._failures == 0
+
+
+def test_half_open_failure_reopens_immediately(clock):
+    cache = Cache()
+    cache.client = FlakyRedis()
+    for _ in range(CIRCUIT_FAILURE_THRESHOLD):
+        asyncio.run(cache.get("k"))
+
+    clock.now += CIRCUIT_COOLDOWN
+    assert asyncio.run(cache.get("k")) is None
+    calls = cache.client.calls
+
+    cache.client.down = False
+    assert asyncio.run(cache.get("k")) is None
+    assert cache.client.calls == calls
+
+
+def test_command_errors_do_not_trip_the_breaker(clock):
+    class WrongTypeRedis:
+        async def incr(self, key, amount):
+            raise ResponseError("WRONGTYPE Operation against a key holding the wrong kind of value")
+
+    cache = Cache()
+    cache.client = WrongTypeRedis()
+    for _ in range(CIRCUIT_FAILURE_THRESHOLD * 2):
+        assert asyncio.run(cache.increment("bad")) is None
+
+    assert cache._failures == 0
+    assert cache._available()
+
+
+def test_expire_returns_int_like_its_siblings():
+    class ExpireRedis:
+        async def expire(self, key, seconds):
+            return key == "present"
+
+    cache = Cache()
+    cache.client = ExpireRedis()
+
+    assert asyncio.run(cache.expire("present", 60)) == 1
+    assert type(asyncio.run(cache.expire("present", 60))) is int
+    assert asyncio.run(cache.expire("missing", 60)) == 0
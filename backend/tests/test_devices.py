@@ -0,0 +1,21 @@
+from fastapi.testclient import TestClient
+
+from src.api.main import app
+from src.api.routes import devices
+from src.utils.metrics import METRICS
+
+client = TestClient(app)
+
+
+def test_cached_device_list_still_updates_device_count():
+    devices._LIST_CACHE.clear()
+    params = {"status": "active", "size": 5}
+
+    first = client.get("/api/devices/", params=params)
+    total = first.json()["total"]
+
+    METRICS.update_device_count(-1)
+    second = client.get("/api/devices/", params=params)
+
+    assert second.content == first.content
+    assert METRICS.metrics["device_count"] == total
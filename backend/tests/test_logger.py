@@ -0,0 +1,13 @@
+from src.utils import logger as logger_module
+
+
+def test_listener_starts_on_first_record_and_stops_cleanly():
+    logger_module.stop_logging()
+    log = logger_module.setup_logger("tests.logger")
+    assert logger_module._listener is None
+
+    log.info("first record")
+    assert logger_module._listener is not None
+
+    logger_module.stop_logging()
+    assert logger_module._listener is None
@@ -0,0 +1,65 @@
+import asyncio
+
+from fastapi import Request, Response
+
+from src.api.middleware import RateLimitMiddleware
+
+
+def _request(host):
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": [], "client": (host, 1234)})
+
+
+async def _ok(request):
+    return Response("ok")
+
+
+def _hit(limiter, host="10.0.0.1"):
+    return asyncio.run(limiter.dispatch(_request(host), _ok)).status_code
+
+
+def test_requests_beyond_the_bucket_are_rejected(clock):
+    limiter = RateLimitMiddleware(None, calls_per_minute=3)
+
+    assert [_hit(limiter) for _ in range(4)] == [200, 200, 200, 429]
+
+
+def test_bucket_refills_with_elapsed_time(clock):
+    limiter = RateLimitMiddleware(None, calls_per_minute=60)
+    for _ in range(60):
+        _hit(limiter)
+    assert _hit(limiter) == 429
+
+    clock.now += 0.5
+    assert _hit(limiter) == 429
+
+    clock.now += 0.5
+    assert _hit(limiter) == 200
+    assert _hit(limiter) == 429
+
+
+def test_refill_is_capped_at_the_bucket_size(clock):
+    limiter = RateLimitMiddleware(None, calls_per_minute=2)
+    _hit(limiter)
+
+    clock.now += 3600
+    assert [_hit(limiter) for _ in range(3)] == [200, 200, 429]
+
+
+def test_clients_have_separate_buckets(clock):
+    limiter = RateLimitMiddleware(None, calls_per_minute=1)
+
+    assert _hit(limiter, "10.0.0.1") == 200
+    assert _hit(limiter, "10.0.0.1") == 429
+    assert _hit(limiter, "10.0.0.2") == 200
+
+
+def test_least_recently_seen_client_is_evicted(clock):
+    limiter = RateLimitMiddleware(None, calls_per_minute=1, max_clients=2)
+    _hit(limiter, "a")
+    _hit(limiter, "b")
+    _hit(limiter, "a")  # rejected, but still marks "a" as recently seen
+    _hit(limiter, "c")
+
+    assert list(limiter.clients) == ["a", "c"]
+    # "b" starts over with a full bucket
+    assert _hit(limiter, "b") == 200
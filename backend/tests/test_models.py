@@ -0,0 +1,28 @@
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateIndex
+
+from src.database.models import Alert, Device
+
+
+def _ddl(table):
+    return {
+        index.name: str(CreateIndex(index).compile(dialect=postgresql.dialect()))
+        for index in table.indexes
+    }
+
+
+def test_open_alert_index_is_partial_on_status():
+    ddl = _ddl(Alert.__table__)
+
+    assert ddl["idx_alerts_open"] == (
+        "CREATE INDEX idx_alerts_open ON alerts (device_id) WHERE status = 'open'"
+    )
+
+
+def test_device_listing_indexes_lead_with_filter_column():
+    ddl = _ddl(Device.__table__)
+
+    assert ddl["idx_devices_status_last_seen"].endswith("(status, last_seen DESC)")
+    assert ddl["idx_devices_type_last_seen"].endswith("(device_type, last_seen DESC)")
+    assert ddl["idx_devices_vendor_last_seen"].endswith("(vendor, last_seen DESC)")
+    assert ddl["idx_devices_high_risk"].endswith("WHERE risk_score >= 0.5")
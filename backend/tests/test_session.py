@@ -0,0 +1,55 @@
+import asyncio
+
+from sqlalchemy import Column, Integer, MetaData, String, Table
+from sqlalchemy.dialects import postgresql
+
+from src.database import session as session_module
+from src.database.session import bulk_insert
+from src.utils.metrics import MetricsCollector
+
+flows = Table(
+    "flows",
+    MetaData(),
+    Column("id", Integer, primary_key=True),
+    Column("protocol", String(20)),
+)
+
+
+class RecordingSession:
+    def __init__(self):
+        self.statements = []
+
+    async def execute(self, statement, *args):
+        assert not args, "rows must be inlined as VALUES, not sent as executemany"
+        self.statements.append(statement)
+
+
+def test_bulk_insert_sends_chunked_multi_row_values(monkeypatch):
+    monkeypatch.setattr(session_module, "BULK_INSERT_CHUNK_SIZE", 2)
+    session = RecordingSession()
+    rows = [{"id": i, "protocol": "TCP"} for i in range(5)]
+
+    asyncio.run(bulk_insert(session, flows, rows))
+
+    sql = [str(s.compile(dialect=postgresql.dialect())) for s in session.statements]
+    assert len(sql) == 3
+    assert "VALUES (%(id_m0)s, %(protocol_m0)s), (%(id_m1)s, %(protocol_m1)s)" in sql[0]
+    assert sql[2].count("), (") == 0
+
+
+def test_bulk_insert_skips_empty_rows():
+    session = RecordingSession()
+    asyncio.run(bulk_insert(session, flows, []))
+    assert session.statements == []
+
+
+def test_pool_gauges_are_sampled_when_metrics_are_read():
+    collector = MetricsCollector()
+    checked_out = [0]
+    collector.set_db_pool_source(lambda: {"checked_out": checked_out[0]})
+
+    checked_out[0] = 3
+    assert collector.get_metrics()["db_pool"] == {"checked_out": 3}
+
+    checked_out[0] = 1
+    assert collector.get_metrics()["db_pool"] == {"checked_out": 1}
@@ -0,0 +1,62 @@
+from src.utils.ttl_cache import TTLCache
+
+
+def test_get_returns_value_until_ttl_expires(clock):
+    cache = TTLCache(ttl=3.0)
+    cache.set("a", 1)
+
+    clock.now += 2.9
+    assert cache.get("a") == 1
+
+    clock.now += 0.2
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_set_purges_expired_entries(clock):
+    cache = TTLCache(ttl=3.0)
+    for key in range(10):
+        cache.set(key, key)
+
+    clock.now += 5.0
+    cache.set("fresh", 1)
+
+    assert len(cache) == 1
+    assert cache.get("fresh") == 1
+
+
+def test_set_evicts_oldest_live_entry_when_full(clock):
+    cache = TTLCache(ttl=3.0, maxsize=2)
+    cache.set("a", 1)
+    clock.now += 1.0
+    cache.set("b", 2)
+    clock.now += 1.0
+    cache.set("c", 3)
+
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+    assert cache.get("c") == 3
+
+
+def test_resetting_key_refreshes_its_expiry_and_order(clock):
+    cache = TTLCache(ttl=3.0, maxsize=2)
+    cache.set("a", 1)
+    clock.now += 1.0
+    cache.set("b", 2)
+    cache.set("a", 10)
+    clock.now += 1.0
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 10
+
+    clock.now += 2.5
+    assert cache.get("a") is None
+    assert cache.get("c") == 3
+
+
+def test_clear_drops_everything(clock):
+    cache = TTLCache()
+    cache.set("a", 1)
+    cache.clear()
+    assert cache.get("a") is None